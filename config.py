@@ -1,27 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import MySQLdb
-import MySQLdb.cursors
-
-
 """ Configuration options for MySQL-Filler. """
 
                                            # POPULATE
 
 NUM_ROWS = 10                              # number of rows to add to all database tables
 PROCS = 1                                  # number of processes to spawn
+START_METHOD = 'forkserver'                # multiprocessing start method: 'forkserver' (workers forked from a preloaded server), 'spawn' or 'fork'; 'spawn' where unavailable
+POOL_START_TIMEOUT = 60                    # seconds for all worker processes to start and connect before aborting
 
 JUMBLE_FKS = True                          # toggle random jumbling of foreign keys for joins
 FK_PCT_REPLACE = 25                        # percentage of NUM_ROWS of foreign keys to jumble
 
 STRICT_INSERT = False                      # toggle INSERT IGNOREs for duplicate hits / bypass strict SQL mode (warnings versus errors)
 
+SERVER_GEN = False                         # generate simple column types in MySQL with INSERT ... SELECT (no row data sent); other columns fall back to client generation
+SERVER_GEN_BATCH = 100000                  # rows per server-side INSERT ... SELECT statement
+SERVER_GEN_CLIENT_BATCH = 1000             # maximum rows per UNION ALL derived table of client-generated columns
+COMPARE_GEN = False                        # time client (executemany) versus server (INSERT ... SELECT) generation per table, rolling back both (transactional tables only)
+
 PROCESS_INT_FKS = True                     # default: True; process (True) or skip (False) integer foreign keys (TPCC schema with tinyint PKs)
 COMPOSITE_PK_INCREMENT = False             # default: False; skip (False) or increment (True) composite primary keys (TPCC schema)
 
 COMPLEX_JSON = False                       # False for simple fixed JSON data; True to generate variable JSON data
 
+DISTRIBUTIONS = {}                         # per-column value distributions, keyed 'table.column' or 'column', e.g. {'player.team_id': ('zipf', 1.1)}
+DIST_MAX_RANKS = 100000                    # maximum distinct values in a zipf table (larger ranges use the first DIST_MAX_RANKS values)
+DIST_BATCH = 1024                          # number of values sampled per batch from a distribution table
+
+LOB_DEFAULT_SIZE = (1, 255)                # (min, max) payload bytes for TEXT/BLOB/VARBINARY columns not listed in LOB_SIZES
+LOB_SIZES = {}                             # per-column (min, max) payload bytes, keyed 'table.column' or 'column', e.g. {'t.blb': (1024, 1048576)}
+LOB_BUFFER_SIZE = 16777216                 # bytes of the preallocated random buffer per process that payloads are sliced from (largest payload size)
+LOB_PACKET_MARGIN = 4096                   # bytes of max_allowed_packet reserved for statement overhead
+
 BYTES_DECODE = 'utf-8'                     # character set used for byte data type conversion
 MAX_PACKET = False                         # True maximises the packet size (root user only)
 
@@ -32,6 +44,10 @@ TRUNCATE_TABLES = False                    # toggle truncation of all database t
 
 
                                            # DATABASE
+DRIVER = 'mysqlclient'                     # database driver: 'mysqlclient' (MySQLdb), 'pymysql', or 'mysql.connector' (C extension)
+BENCHMARK_DRIVERS = False                  # measure the insert throughput of each installed driver on the database (inserts rolled back) instead of populating
+BENCHMARK_ROUNDS = 3                       # timed rounds per driver, in alternating driver order, after one untimed warm-up pass
+
 DB_CONFIG = dict(
     user    = 'general',                   # USERNAME
     passwd  = 'P@55w0rd',                  # USER PASSWORD
@@ -39,5 +55,4 @@ DB_CONFIG = dict(
     db      = 'basketball',                # DATABASE NAME
     port    = 3306,
     #charset = 'utf8mb4',                  # force character set (beware binary data types)
-    cursorclass=MySQLdb.cursors.DictCursor
 )
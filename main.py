@@ -3,6 +3,7 @@
 
 """ MySQL-Filler execute. """
 
-from src.mysql_filler import MySQLFiller
+from src.mysql_filler import main
 
-MySQLFiller()
+if __name__ == '__main__':
+    main()
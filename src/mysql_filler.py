@@ -6,13 +6,15 @@
 """
 
 
-import binascii
 import datetime
+import importlib
 import json
 import math
 import multiprocessing as mp
+import os
 import random
 import re
+import statistics
 import string
 import sys
 import time
@@ -21,6 +23,208 @@ import uuid
 from config import *
 
 
+# ASCII-letter translation table for the LOB buffer: 1 byte per character, no escape expansion
+LOB_CHARS = bytes((string.ascii_uppercase + string.ascii_lowercase).encode()[i % 52] for i in range(256))
+LOB_BUFFER = None # per-process random buffer, created on first use
+PREPARED = {}     # per-process lookup cursors, keyed by query, reused for server-side prepared statements
+
+CONN = None       # per-process connection, set by db_init()
+DB_DRIVER = None  # per-process Driver, set by db_init()
+FILLER = None     # per-process worker MySQLFiller, set by init_worker()
+INHERITED_CONN = None
+
+
+class Driver():
+
+    """
+        Driver
+        Wrap a DB-API driver: connection arguments, error class, LOB encoding and prepared statement support.
+        Cursors are the driver default tuple cursors.
+    """
+
+
+    modules = {
+        'mysqlclient': 'MySQLdb',
+        'pymysql': 'pymysql',
+        'mysql.connector': 'mysql.connector'
+    }
+
+
+    def __init__(self, name):
+
+        """ Import the driver module. """
+
+        if name not in self.modules:
+            raise ValueError('unknown driver: ' + str(name) + ' (' + ', '.join(self.modules) + ')')
+
+        self.name = name
+        self.module = importlib.import_module(self.modules[name])
+        self.error = self.module.Error
+        self.prepared = name == 'mysql.connector' # server-side prepared statements
+        self.lob_bytes = name == 'mysql.connector' # C extension converts bytes, not memoryview
+
+        if name == 'mysql.connector' and not getattr(self.module, 'HAVE_CEXT', False):
+            raise ImportError('mysql.connector C extension not available')
+
+
+    @classmethod
+    def installed(cls):
+
+        """ Names of the importable drivers. """
+
+        names = []
+
+        for name in cls.modules:
+            try:
+                cls(name)
+                names.append(name)
+            except ImportError:
+                pass
+
+        return names
+
+
+    def connect(self, db_config):
+
+        """ Connect with DB_CONFIG keys mapped to the driver's argument names. """
+
+        config = dict(db_config)
+
+        if self.name != 'mysqlclient':
+            config['password'] = config.pop('passwd')
+            config['database'] = config.pop('db')
+        if self.name == 'mysql.connector':
+            config['use_pure'] = False
+
+        conn = self.module.connect(**config)
+
+        # pass LOB buffer slices straight to the escaper without an intermediate str
+        if self.name == 'mysqlclient':
+            conn.encoders[memoryview] = lambda val, _: conn.string_literal(val.tobytes())
+        elif self.name == 'pymysql':
+            conn.encoders[memoryview] = lambda val, mapping=None: conn.escape(val.tobytes())
+
+        return conn
+
+
+    def cursor(self, conn, prepared=False):
+        """ Cursor, prepared where requested and supported. """
+        if prepared and self.prepared:
+            return conn.cursor(prepared=True)
+        return conn.cursor()
+
+# end class
+
+
+class Distribution():
+
+    """
+        Distribution
+        Sample skewed values from precomputed tables: alias tables for discrete
+        distributions (zipf, weighted) and inverse CDF tables for continuous
+        distributions (normal, exponential).
+
+        Samples are ranks for zipf, indexes into the weights for weighted,
+        absolute values for normal, and offsets from the range start for exponential.
+    """
+
+
+    cdf_points = 4096
+
+
+    def __init__(self, spec, num_ranks):
+
+        """ Build the sampling table for spec over num_ranks discrete values. """
+
+        self.kind = spec[0]
+        self.discrete = self.kind in ['zipf', 'weighted']
+
+        if self.kind == 'zipf':
+            exponent = spec[1] if len(spec) > 1 else 1.0
+            self.build_alias([1.0 / (rank ** exponent) for rank in range(1, num_ranks + 1)])
+
+        elif self.kind == 'weighted':
+            weights = spec[1].values() if isinstance(spec[1], dict) else spec[1]
+            self.build_alias([float(w) for w in weights])
+
+        elif self.kind == 'normal':
+            inv_cdf = statistics.NormalDist(spec[1], spec[2]).inv_cdf
+            self.build_cdf(inv_cdf)
+
+        elif self.kind == 'exponential':
+            mean = spec[1]
+            self.build_cdf(lambda p: -mean * math.log(1.0 - p))
+
+        else:
+            raise ValueError('unknown distribution: ' + str(self.kind))
+
+
+    def build_alias(self, weights):
+
+        """ Build Vose alias table from weights. """
+
+        num = len(weights)
+        total = sum(weights)
+        self.pmf = [w / total for w in weights]
+        scaled = [w * num / total for w in weights]
+        prob = [1.0] * num
+        alias = list(range(num))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+
+        while small and large:
+            sml = small.pop()
+            lrg = large.pop()
+            prob[sml] = scaled[sml]
+            alias[sml] = lrg
+            scaled[lrg] = (scaled[lrg] + scaled[sml]) - 1.0
+            if scaled[lrg] < 1.0:
+                small.append(lrg)
+            else:
+                large.append(lrg)
+
+        self.prob = prob
+        self.alias = alias
+
+
+    def build_cdf(self, inv_cdf):
+
+        """ Build inverse CDF table of cdf_points intervals, clipping the open ends. """
+
+        points = self.cdf_points
+        edge = 0.5 / points
+        self.quantiles = [inv_cdf(min(max(i / points, edge), 1.0 - edge)) for i in range(points + 1)]
+
+
+    def sample(self, num):
+
+        """ Draw num values: one random() per value, reusing its fraction for the alias or interpolation step. """
+
+        rnd = random.random
+        values = []
+
+        if self.discrete:
+            prob = self.prob
+            alias = self.alias
+            size = len(prob)
+            for _ in range(num):
+                pos = rnd() * size
+                idx = int(pos)
+                values.append(idx if pos - idx < prob[idx] else alias[idx])
+        else:
+            quantiles = self.quantiles
+            size = self.cdf_points
+            for _ in range(num):
+                pos = rnd() * size
+                idx = int(pos)
+                low = quantiles[idx]
+                values.append(low + (quantiles[idx + 1] - low) * (pos - idx))
+
+        return values
+
+# end class
+
+
 class MySQLFiller():
 
     """
@@ -36,17 +240,43 @@ class MySQLFiller():
 
 
     foreign_keys = []
+    max_packet = 4194304
+    seq_cte = False
+    mariadb = False
     start_year = 1970
     end_year = datetime.date.today().year
 
+    lob_limits = {
+        'tinytext': 255, 'text': 65535, 'mediumtext': 16777215, 'longtext': 4294967295,
+        'tinyblob': 255, 'blob': 65535, 'mediumblob': 16777215, 'longblob': 4294967295
+    }
 
-    def __init__(self):
 
-        """ Initialise and execute methods. """
+    def __init__(self, schema=None):
+
+        """ Initialise and execute methods; given a schema from get_schema(), initialise a pool worker only. """
+
+        if schema is not None:
+            self.__dict__.update(schema)
+            return
+
+        db_init()
         self.get_foreign_keys()
+        self.get_max_packet()
+        self.get_server_version()
         self.process()
 
 
+    def get_schema(self):
+        """ Immutable schema and FK model, shipped once to each pool worker. """
+        return {
+            'foreign_keys': self.foreign_keys,
+            'max_packet': self.max_packet,
+            'seq_cte': self.seq_cte,
+            'mariadb': self.mariadb
+        }
+
+
     def process(self):
 
         """ Query and start allocate processing of database tables. """
@@ -74,9 +304,8 @@ class MySQLFiller():
             print('The `' + DB_CONFIG['db'] + '` database appears to contain no tables!')
             sys.exit(1)
 
-        for table_name in results:
-            for k in table_name:
-                tables.append(table_name[k])
+        for table_row in results:
+            tables.append(self.text(table_row[0]))
 
         if TRUNCATE_TABLES:
 
@@ -84,23 +313,38 @@ class MySQLFiller():
             with CONN.cursor() as cursor:
                 for table in tables:
                     try:
-                        trc = cursor.execute('TRUNCATE TABLE `' + table + '`')
-                        if trc != 0:
+                        cursor.execute('TRUNCATE TABLE `' + table + '`')
+                        trc = cursor.rowcount
+                        if trc > 0:
                             print('truncation failed for `' + table + '`')
                         else:
                             print('truncated table `' + table + '`')
-                    except MySQLdb.Error as err:
+                    except DB_DRIVER.error as err:
                         print(err)
+        elif BENCHMARK_DRIVERS:
+
+            print(DB_CONFIG['host'])
+            print(DB_CONFIG['db'])
+            print('+' + str(NUM_ROWS) + ' rows per table, rolled back\n')
+
+            self.benchmark_drivers(tables)
+
         else:
 
             print(DB_CONFIG['host'])
             print(DB_CONFIG['db'])
             print('+' + str(NUM_ROWS) + ' rows\n')
 
-            with mp.Pool(processes=PROCS) as pool:
-                results = pool.map(self.worker, tables)
+            with self.start_pool() as pool:
+                results = list(pool.imap_unordered(fill_table, tables))
+
+            if COMPARE_GEN:
+                timings = [r for r in results if r]
+                client_time = sum(t[0] for t in timings)
+                server_time = sum(t[1] for t in timings)
+                print('\nclient %.3fs, server %.3fs (%.1fx), all inserts rolled back' % (client_time, server_time, client_time / server_time if server_time else 0))
 
-            if JUMBLE_FKS:
+            if JUMBLE_FKS and not COMPARE_GEN: # compared inserts are rolled back
                 if self.foreign_keys:
                     self.jumble_foreign_keys()
                 else:
@@ -112,10 +356,89 @@ class MySQLFiller():
             CONN.close()
 
 
+    def start_pool(self):
+
+        """
+            Start a pre-warmed pool: workers connect and receive the schema once in init_worker(),
+            then tasks carry only the table name. Reports startup and task dispatch latency.
+        """
+
+        method = START_METHOD if START_METHOD in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(method)
+
+        if method == 'forkserver':
+            # fork workers from a server that has already imported this module and the driver
+            ctx.set_forkserver_preload([__name__, Driver.modules[DRIVER]])
+
+        start = time.perf_counter()
+        pool = ctx.Pool(processes=PROCS, initializer=init_worker, initargs=(self.get_schema(),))
+
+        # warm-up: no-op tasks until every worker has initialised and answered, then time task dispatch to the warm workers
+        pids = set()
+        deadline = start + POOL_START_TIMEOUT
+
+        try:
+            while len(pids) < PROCS:
+                pings = pool.map_async(ping_worker, [start] * PROCS, chunksize=1)
+                pids.update(pid for pid, _ in pings.get(timeout=max(deadline - time.perf_counter(), 0)))
+        except mp.TimeoutError:
+            pool.terminate()
+            print('** only %d of %d worker processes started within %ds (check the connection limit, e.g. max_connections)' % (len(pids), PROCS, POOL_START_TIMEOUT))
+            sys.exit(1)
+
+        startup = time.perf_counter() - start
+        latencies = sorted(pool.apply_async(ping_worker, (time.perf_counter(),)).get()[1] for _ in range(PROCS * 4))
+
+        print('pool startup %.3fs (%s, %d processes), task dispatch median %.2fms, max %.2fms\n' % (
+            startup, method, PROCS, latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000))
+
+        return pool
+
+
     def worker(self, table):
 
         """ Worker process. """
 
+        table_name, cols, params = self.table_params(table)
+        insert = self.insert_query(table_name, cols)
+
+        if DEBUG:
+            print(insert)
+            print(params)
+
+        if table_name != '':
+
+            with CONN.cursor() as cursor:
+
+                try:
+
+                    if COMPARE_GEN:
+                        return self.compare_insert(cursor, table_name, insert, cols, params)
+
+                    if SERVER_GEN:
+                        self.server_insert(cursor, table_name, cols, params)
+                    else:
+                        self.client_insert(cursor, insert, params)
+
+                    CONN.commit()
+                    print('`' + table + '`')
+
+                except DB_DRIVER.error as err:
+                    CONN.rollback()
+                    if STRICT_INSERT:
+                        print('** `' + table + '` not populated')
+                        print(err)
+                    if DEBUG:
+                        print('rolled back `' + table + '`')
+                        print(err)
+
+        return None
+
+
+    def table_params(self, table):
+
+        """ Get the table name, insert columns and column parameters from the table's column metadata. """
+
         column_query = """
             SELECT
                 TABLE_NAME,
@@ -141,52 +464,51 @@ class MySQLFiller():
             column_results = cursor.fetchall()
 
         cols = []
-        placeholder = []
         params = []
 
         table_name = ''
 
         for tab_dat in column_results:
 
-            table_name = tab_dat['TABLE_NAME']
-            data_type = tab_dat['DATA_TYPE']
+            (table_name, column_name, data_type, char_length, num_precision, num_scale,
+             dt_precision, column_type, column_key, extra) = tab_dat
 
-            if isinstance(data_type, bytes): # MySQL 8
-                data_type = data_type.decode(BYTES_DECODE)
+            # MySQL 8 metadata may be bytes
+            table_name, column_name, data_type = self.text(table_name), self.text(column_name), self.text(data_type)
+            column_type, column_key, extra = self.text(column_type), self.text(column_key), self.text(extra)
 
             # skip auto-generated primary keys
-            if tab_dat['COLUMN_KEY'] == 'PRI':
+            if column_key == 'PRI':
 
-                if tab_dat['EXTRA'] == 'auto_increment' and len(column_results) != 1:
+                if extra == 'auto_increment' and len(column_results) != 1:
                     continue
-                if tab_dat['EXTRA'] == 'DEFAULT_GENERATED':
+                if extra == 'DEFAULT_GENERATED':
                     continue
 
             # skip spatial types
             if data_type in ['geometry', 'point', 'linestring', 'polygon', 'multipoint', 'multilinestring', 'multipolygon', 'geometrycollection']:
                 continue
 
-            cols.append(tab_dat['COLUMN_NAME'])
-            placeholder.append('%s')
+            cols.append(column_name)
             dtype = ()
 
             # strings
             if data_type in ['char', 'varchar']:
 
-                length = 255 if tab_dat['CHARACTER_MAXIMUM_LENGTH'] > 255 else tab_dat['CHARACTER_MAXIMUM_LENGTH']
+                length = 255 if char_length > 255 else char_length
 
-                if tab_dat['COLUMN_KEY'] == 'PRI' or tab_dat['COLUMN_KEY'] == 'UNI': # character primaries
-                    dtype = ('ck', length, [tab_dat['TABLE_NAME'], tab_dat['COLUMN_NAME']])
+                if column_key == 'PRI' or column_key == 'UNI': # character primaries
+                    dtype = ('ck', length, [table_name, column_name])
                 else:
                     dtype = ('s', length)
 
             elif data_type in ['text', 'tinytext', 'mediumtext', 'longtext']:
-                dtype = ('s', 255)
+                dtype = ('lob',) + self.get_lob_size(table_name, column_name, self.lob_limits[data_type])
 
             # integers
             elif 'int' in data_type:
 
-                if PROCESS_INT_FKS and tab_dat['COLUMN_NAME'] in self.foreign_keys:
+                if PROCESS_INT_FKS and column_name in self.foreign_keys:
 
                     last_fk_value = """
                         SELECT `%s`
@@ -194,55 +516,53 @@ class MySQLFiller():
                         ORDER BY `%s`
                         DESC LIMIT 1
                         """ % (
-                            self.foreign_keys[tab_dat['COLUMN_NAME']]['column'],
-                            self.foreign_keys[tab_dat['COLUMN_NAME']]['table'],
-                            self.foreign_keys[tab_dat['COLUMN_NAME']]['column']
+                            self.foreign_keys[column_name]['column'],
+                            self.foreign_keys[column_name]['table'],
+                            self.foreign_keys[column_name]['column']
                         )
 
-                    with CONN.cursor() as cursor:
-                        cursor.execute(last_fk_value)
-                        fk_result = cursor.fetchall()
+                    fk_result = self.fetch_prepared(last_fk_value)
 
                     if not fk_result:
-                        if tab_dat['COLUMN_KEY'] == 'PRI':
+                        if column_key == 'PRI':
                             dtype = ('ipk', 0)
                         else:
                             dtype = ('ifk1', 1)
                     else:
-                        val = int(fk_result[0][self.foreign_keys[tab_dat['COLUMN_NAME']]['column']])
+                        val = int(fk_result[0][0])
 
-                        if tab_dat['COLUMN_KEY'] == 'PRI':
+                        if column_key == 'PRI':
                             dtype = ('ipk', val)
                         else:
                             dtype = ('ifkm', val)
 
                 else:
                     if data_type == 'int':
-                        if 'unsigned' in tab_dat['COLUMN_TYPE']:
+                        if 'unsigned' in column_type:
                             dtype = ('i', 0, 4294967295)
                         else:
                             dtype = ('i', -2147483648, 2147483647)
 
                     elif data_type == 'tinyint':
-                        if 'unsigned' in tab_dat['COLUMN_TYPE']:
+                        if 'unsigned' in column_type:
                             dtype = ('i', 0, 255)
                         else:
                             dtype = ('i', -127, 127)
 
                     elif data_type == 'smallint':
-                        if 'unsigned' in tab_dat['COLUMN_TYPE']:
+                        if 'unsigned' in column_type:
                             dtype = ('i', 0, 65535)
                         else:
                             dtype = ('i', -32768, 32767)
 
                     elif data_type == 'mediumint':
-                        if 'unsigned' in tab_dat['COLUMN_TYPE']:
+                        if 'unsigned' in column_type:
                             dtype = ('i', 0, 16777215)
                         else:
                             dtype = ('i', -8388608, 8388607)
 
                     elif data_type == 'bigint':
-                        if 'unsigned' in tab_dat['COLUMN_TYPE']:
+                        if 'unsigned' in column_type:
                             dtype = ('i', 0, 18446744073709551615)
                         else:
                             dtype = ('i', -9223372036854775808, 9223372036854775807)
@@ -250,26 +570,26 @@ class MySQLFiller():
             # floats
             elif data_type in ['float', 'double']:
 
-                dec_pl = int(tab_dat['NUMERIC_SCALE']) if tab_dat['NUMERIC_SCALE'] else 1
-                sign = False if 'unsigned' in tab_dat['COLUMN_TYPE'] else True
+                dec_pl = int(num_scale) if num_scale else 1
+                sign = False if 'unsigned' in column_type else True
 
                 if isinstance(data_type, float): # catch Joomla's 'NoneType'
-                    length = int(tab_dat['NUMERIC_PRECISION']) - int(tab_dat['NUMERIC_SCALE'])
+                    length = int(num_precision) - int(num_scale)
                     if length > 6:
                         length = length * (1000 - 1)
                     dtype = ('f', length, dec_pl, sign)
 
-                elif 'unsigned' in tab_dat['COLUMN_TYPE']:
+                elif 'unsigned' in column_type:
                     length = 1
-                    if tab_dat['NUMERIC_PRECISION'] and tab_dat['NUMERIC_SCALE']:
-                        length = int(tab_dat['NUMERIC_PRECISION']) - int(tab_dat['NUMERIC_SCALE'])
+                    if num_precision and num_scale:
+                        length = int(num_precision) - int(num_scale)
                     dtype = ('f', length, dec_pl, sign)
 
                 else:
                     dtype = ('f', 10, dec_pl, False)
 
             elif data_type == 'decimal':
-                dtype = ('dc', tab_dat['NUMERIC_SCALE'])
+                dtype = ('dc', num_scale)
 
             # date-time
             elif data_type == 'date':
@@ -277,152 +597,325 @@ class MySQLFiller():
             elif data_type == 'year':
                 dtype = ('y', 0)
             elif data_type == 'datetime':
-                dtype = ('dt', tab_dat['DATETIME_PRECISION'])
+                dtype = ('dt', dt_precision)
             elif data_type == 'timestamp':
                 dtype = ('ts', 0)
             elif data_type == 'time':
-                dtype = ('tt', tab_dat['DATETIME_PRECISION'])
+                dtype = ('tt', dt_precision)
 
             # others
             elif data_type in ['enum', 'set']:
-                ef_choices = re.findall(r"\'([\w\-\s]+)\'", tab_dat['COLUMN_TYPE'])
+                ef_choices = re.findall(r"\'([\w\-\s]+)\'", column_type)
                 dtype = ('enum', ef_choices)
             elif data_type == 'bit':
                 dtype = ('bit', 0)
             elif data_type == 'json':
                 dtype = ('json', 0)
             elif data_type in ['tinyblob', 'blob', 'mediumblob', 'longblob']:
-                dtype = ('blob', 0)
+                dtype = ('lob',) + self.get_lob_size(table_name, column_name, self.lob_limits[data_type])
             elif data_type in ['binary', 'varbinary']:
                 # uuid
-                if tab_dat['CHARACTER_MAXIMUM_LENGTH'] == 16:
+                if char_length == 16:
                     dtype = ('uuid', 0)
+                elif data_type == 'binary': # fixed length
+                    dtype = ('bin', self.get_lob_cap(char_length))
                 else:
-                    length = tab_dat['CHARACTER_MAXIMUM_LENGTH']
-                    dtype = ('bin', length)
+                    dtype = ('lob',) + self.get_lob_size(table_name, column_name, char_length)
 
             # not supported
             else:
                 print('** unknown data type: ' + data_type)
 
+            dist_spec = self.get_distribution(table_name, column_name)
+            if dist_spec:
+                dtype = self.dist_param(dist_spec, dtype, column_name)
+
             params.append(dtype)
 
+        self.clamp_lob_row(params)
+
+        return (table_name, cols, params)
+
+
+    def insert_query(self, table_name, cols):
+
+        """ Parameterised INSERT for the table columns. """
+
         ignore = 'IGNORE' if not STRICT_INSERT else ''
 
-        insert = """
+        return """
             INSERT %s INTO `%s`
                 (%s)
             VALUES
                 (%s)
-            """ % (ignore, table_name, ','.join(['`{0}`'.format(c) for c in cols]), ','.join(['{0}'.format(d) for d in placeholder]))
+            """ % (ignore, table_name, ','.join(['`{0}`'.format(c) for c in cols]), ','.join(['%s'] * len(cols)))
 
-        if DEBUG:
-            print(insert)
-            print(params)
+    def client_insert(self, cursor, insert, params):
 
-        if table_name != '':
+        """ Insert client-generated rows with executemany. """
 
-            with CONN.cursor() as cursor:
+        for values in self.gen_batches(params, NUM_ROWS):
+            cursor.executemany(insert, values)
+
+
+    def gen_batches(self, params, num_rows, max_rows=None):
+
+        """ Generate batches of rows, sized by payload bytes so that large-object tables stay under max_allowed_packet. """
 
+        row_base = 32 * len(params)
+        batch_limit = self.max_packet - LOB_PACKET_MARGIN
+
+        values = []
+        batch_bytes = 0
+
+        for row in self.gen_rows(params, num_rows):
+
+            row_bytes = row_base + sum(len(val) for val in row if isinstance(val, (str, bytes, memoryview)))
+
+            if values and (batch_bytes + row_bytes > batch_limit or len(values) == max_rows):
+                yield values
                 values = []
-                i_val = 0
-                inc = False
-
-                for _ in range(NUM_ROWS):
-
-                    row = []
-
-                    for param in params:
-
-                        if param[0] == 's':
-                            val = self.gen_string(param[1])
-
-                        elif param[0] == 'uuid':
-                            val = uuid.uuid4().bytes # big endian (else: .bytes_le)
-
-                        elif param[0] == 'ifk1':
-                            val = param[1]
-
-                        elif param[0] == 'ipk':
-                            if not inc:
-                                i_val = self.gen_inc_int(param[1])
-                                inc = True
-                            else:
-                                i_val = self.gen_inc_int(i_val)
-
-                            val = i_val
-
-                        elif param[0] == 'ifkm':
-
-                            if not COMPOSITE_PK_INCREMENT:
-                                val = param[1]
-                            else:
-                                if not inc:
-                                    i_val = param[1]
-                                    inc = True
-                                else:
-                                    i_val = self.gen_inc_int(i_val)
-
-                                val = i_val
-
-                        elif param[0] == 'ck': # char key
-                            val = self.gen_char_key(param[1], param[2])
-                        elif param[0] == 'i':
-                            val = self.gen_int(param[1], param[2])
-                        elif param[0] == 'f':
-                            val = self.gen_float(param[1], param[2], param[3])
-                        elif param[0] == 'dc':
-                            val = self.gen_decimal(param[1])
-                        elif param[0] == 'd':
-                            val = self.gen_date()
-                        elif param[0] == 'y':
-                            val = self.gen_year()
-                        elif param[0] == 'dt':
-                            val = self.gen_datetime(param[1])
-                        elif param[0] == 'ts':
-                            val = self.gen_datetime(param[1])
-                        elif param[0] == 'tt':
-                            val = self.gen_time(param[1])
-                        elif param[0] == 'enum':
-                            val = random.choice(param[1])
-                        elif param[0] == 'bit':
-                            val = '\x01'
-                        elif param[0] == 'blob':
-                            val = bin(291)
-                        elif param[0] == 'bin':
-                            binv = self.gen_bin(param[1])
-                            val = binv
-                        elif param[0] == 'json':
-                            if not COMPLEX_JSON:
-                                val = json.dumps({'json':'foobar'})
-                            else:
-                                json_tmp = {
-                                    'city': self.gen_city_json(12),
-                                    'state': self.gen_state_json(2),
-                                    'zips': self.gen_zip_json(1000, 99950, 5)
-                                }
-                                val = json.dumps(json_tmp, sort_keys=True)
-
-                        row.append(val)
-
-                    values.append(row)
+                batch_bytes = 0
 
-                    if EXTENDED_DEBUG:
-                        print(row)
+            values.append(row)
+            batch_bytes += row_bytes
 
-                try:
-                    cursor.executemany(insert, values)
-                    CONN.commit()
-                    print('`' + table + '`')
+            if EXTENDED_DEBUG:
+                print(row)
 
-                except MySQLdb.Error as err:
-                    CONN.rollback()
-                    if STRICT_INSERT:
-                        print('** `' + table + '` not populated')
-                        print(err)
-                    if DEBUG:
-                        print('rolled back `' + table + '`')
-                        print(err)
+        if values:
+            yield values
+
+
+    def server_insert(self, cursor, table_name, cols, params):
+
+        """
+            Insert rows generated by MySQL with INSERT ... SELECT.
+            Columns without an SQL expression fall back to client generation, sent as a UNION ALL derived table.
+        """
+
+        exprs = [self.sql_expr(param) for param in params]
+        client_params = [param for param, expr in zip(params, exprs) if expr is None]
+        ignore = 'IGNORE' if not STRICT_INSERT else ''
+
+        insert = 'INSERT %s INTO `%s` (%s) ' % (ignore, table_name, ','.join(['`{0}`'.format(c) for c in cols]))
+
+        if not client_params:
+
+            if self.seq_cte and not self.mariadb:
+                cursor.execute('SET SESSION cte_max_recursion_depth = %d' % max(SERVER_GEN_BATCH, 1000))
+
+            done = 0
+            while done < NUM_ROWS:
+                num = min(SERVER_GEN_BATCH, NUM_ROWS - done)
+                query = insert + 'SELECT ' + ','.join(exprs) + ' FROM ' + self.sql_sequence(num)
+                if EXTENDED_DEBUG:
+                    print(query)
+                cursor.execute(query)
+                done += num
+
+            return
+
+        # mixed: client values only for the fallback columns, referenced as v.c<n>
+        client_idx = 0
+        select = []
+        for expr in exprs:
+            if expr is None:
+                select.append('v.c' + str(client_idx))
+                client_idx += 1
+            else:
+                select.append(expr.replace('%', '%%'))
+
+        query = insert + 'SELECT ' + ','.join(select) + ' FROM ('
+        first_row = 'SELECT ' + ','.join(['%s AS c' + str(i) for i in range(len(client_params))])
+        next_row = ' UNION ALL SELECT ' + ','.join(['%s'] * len(client_params))
+
+        if DEBUG:
+            print('client-generated columns: ' + ','.join([c for c, e in zip(cols, exprs) if e is None]))
+
+        for values in self.gen_batches(client_params, NUM_ROWS, SERVER_GEN_CLIENT_BATCH):
+            derived = first_row + next_row * (len(values) - 1)
+            cursor.execute(query + derived + ') AS v', [val for row in values for val in row])
+
+
+    def compare_insert(self, cursor, table, insert, cols, params):
+
+        """ Time client and server generation of the table, rolling back each: runs client, server, server, client and averages, so neither path always meets a cold cache. """
+
+        timings = [0.0, 0.0]
+
+        for server in [False, True, True, False]:
+            start = time.time()
+            if server:
+                self.server_insert(cursor, table, cols, params)
+            else:
+                self.client_insert(cursor, insert, params)
+            timings[server] += (time.time() - start) / 2
+            CONN.rollback()
+
+        print('`%s` client %.3fs, server %.3fs' % (table, timings[0], timings[1]))
+
+        return tuple(timings)
+
+
+    def sql_expr(self, param):
+
+        """ SQL expression generating a value for the column parameter server-side, or None if the client generator is required. """
+
+        if not param:
+            return None
+
+        kind = param[0]
+
+        if kind in ['s', 'bin']:
+            return "LPAD('', %d, MD5(RAND()))" % param[1]
+        if kind == 'lob':
+            return "LPAD('', %d + FLOOR(RAND() * %d), MD5(RAND()))" % (param[1], param[2] - param[1] + 1)
+        if kind == 'uuid':
+            return "UNHEX(REPLACE(UUID(), '-', ''))"
+        if kind == 'ifk1' or (kind == 'ifkm' and not COMPOSITE_PK_INCREMENT):
+            return str(int(param[1]))
+        if kind == 'i':
+            span = param[2] - param[1] + 1
+            if span <= 2 ** 30:
+                return '%d + FLOOR(RAND() * %d)' % (param[1], span)
+            # RAND() has 2^30 distinct values: combine two into 60 random bits, scaled in exact DECIMAL arithmetic
+            bits = 'CAST(FLOOR(RAND() * 1073741824) AS UNSIGNED)'
+            return '%d + FLOOR(CAST(%s * 1073741824 + %s AS DECIMAL(65, 0)) * %d / 1152921504606846976)' % (param[1], bits, bits, span)
+        if kind == 'f':
+            start = -99 if param[3] else 0
+            return 'ROUND(%d + RAND() * %d, %d)' % (start, param[1] - start, param[2])
+        if kind == 'dc':
+            return 'ROUND(10 + RAND() * 89, %d)' % (param[1] or 0)
+        if kind == 'y':
+            return '%d + FLOOR(RAND() * %d)' % (self.start_year, self.end_year - self.start_year + 1)
+        if kind == 'd':
+            days = (datetime.date(self.end_year, 12, 28) - datetime.date(self.start_year, 1, 1)).days
+            return "DATE_ADD('%d-01-01', INTERVAL FLOOR(RAND() * %d) DAY)" % (self.start_year, days)
+        if kind in ['dt', 'ts']:
+            seconds = int((datetime.datetime(self.end_year, 12, 28) - datetime.datetime(self.start_year, 1, 2)).total_seconds())
+            expr = "DATE_ADD('%d-01-02 00:00:00', INTERVAL FLOOR(RAND() * %d) SECOND)" % (self.start_year, seconds)
+            if param[1]:
+                expr += ' + INTERVAL FLOOR(RAND() * 1000000) MICROSECOND'
+            return expr
+        if kind == 'tt':
+            return 'SEC_TO_TIME(ROUND(3600 + RAND() * 82799, %d))' % (param[1] or 0)
+        if kind == 'enum':
+            return 'ELT(1 + FLOOR(RAND() * %d), %s)' % (len(param[1]), ','.join([self.sql_literal(c) for c in param[1]]))
+        if kind == 'bit':
+            return "b'1'"
+        if kind == 'json' and not COMPLEX_JSON:
+            return self.sql_literal(json.dumps({'json':'foobar'}))
+
+        return None
+
+
+    def sql_literal(self, val):
+        """ Quote a string as an SQL literal. """
+        return "'" + val.replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+    def sql_sequence(self, num):
+
+        """ Derived table of num rows: a recursive CTE where supported, else a cross join of digit tables. """
+
+        if self.seq_cte:
+            return '(WITH RECURSIVE seq (n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %d) SELECT n FROM seq) AS seq' % num
+
+        digits = '(SELECT 0 n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9)'
+        tables = max(1, math.ceil(math.log10(num)))
+
+        return '(SELECT 1 FROM ' + ' CROSS JOIN '.join(['%s d%d' % (digits, i) for i in range(tables)]) + ' LIMIT %d) AS seq' % num
+
+
+    def gen_rows(self, params, num_rows):
+
+        """ Generate rows of values for the column parameters. """
+
+        i_val = 0
+        inc = False
+
+        dists = {idx: self.gen_dist(*param[1:]) for idx, param in enumerate(params) if param[0] == 'dist'}
+
+        for _ in range(num_rows):
+
+            row = []
+
+            for idx, param in enumerate(params):
+
+                if param[0] == 's':
+                    val = self.gen_string(param[1])
+
+                elif param[0] == 'uuid':
+                    val = uuid.uuid4().bytes # big endian (else: .bytes_le)
+
+                elif param[0] == 'ifk1':
+                    val = param[1]
+
+                elif param[0] == 'ipk':
+                    if not inc:
+                        i_val = self.gen_inc_int(param[1])
+                        inc = True
+                    else:
+                        i_val = self.gen_inc_int(i_val)
+
+                    val = i_val
+
+                elif param[0] == 'ifkm':
+
+                    if not COMPOSITE_PK_INCREMENT:
+                        val = param[1]
+                    else:
+                        if not inc:
+                            i_val = param[1]
+                            inc = True
+                        else:
+                            i_val = self.gen_inc_int(i_val)
+
+                        val = i_val
+
+                elif param[0] == 'ck': # char key
+                    val = self.gen_char_key(param[1], param[2])
+                elif param[0] == 'i':
+                    val = self.gen_int(param[1], param[2])
+                elif param[0] == 'f':
+                    val = self.gen_float(param[1], param[2], param[3])
+                elif param[0] == 'dc':
+                    val = self.gen_decimal(param[1])
+                elif param[0] == 'd':
+                    val = self.gen_date()
+                elif param[0] == 'y':
+                    val = self.gen_year()
+                elif param[0] == 'dt':
+                    val = self.gen_datetime(param[1])
+                elif param[0] == 'ts':
+                    val = self.gen_datetime(param[1])
+                elif param[0] == 'tt':
+                    val = self.gen_time(param[1])
+                elif param[0] == 'enum':
+                    val = random.choice(param[1])
+                elif param[0] == 'dist':
+                    val = next(dists[idx])
+                elif param[0] == 'bit':
+                    val = '\x01'
+                elif param[0] == 'lob':
+                    val = self.gen_lob(param[1], param[2])
+                elif param[0] == 'bin':
+                    val = self.gen_bin(param[1])
+                elif param[0] == 'json':
+                    if not COMPLEX_JSON:
+                        val = json.dumps({'json':'foobar'})
+                    else:
+                        json_tmp = {
+                            'city': self.gen_city_json(12),
+                            'state': self.gen_state_json(2),
+                            'zips': self.gen_zip_json(1000, 99950, 5)
+                        }
+                        val = json.dumps(json_tmp, sort_keys=True)
+
+                row.append(val)
+
+            yield row
 
 
     def gen_string(self, length):
@@ -488,10 +981,240 @@ class MySQLFiller():
 
     def gen_bin(self, length):
         """ Generate binary-compatible string to length. """
-        if length > 255:
-            length = 255
-        chars = ''.join(random.choice(string.punctuation) for _ in range(length))
-        return binascii.a2b_qp(chars)
+        buf = self.get_lob_buffer()
+        start = random.randint(0, len(buf) - length)
+        if DB_DRIVER.lob_bytes:
+            return buf[start:start + length].tobytes()
+        return buf[start:start + length]
+
+
+    def gen_lob(self, min_size, max_size):
+        """ Generate TEXT/BLOB payload as a slice of the preallocated LOB buffer. """
+        return self.gen_bin(random.randint(min_size, max_size))
+
+
+    def get_lob_buffer(self):
+        """ Return the random LOB buffer of this process, allocating it on first use. """
+        global LOB_BUFFER
+        if LOB_BUFFER is None:
+            LOB_BUFFER = memoryview(os.urandom(LOB_BUFFER_SIZE).translate(LOB_CHARS))
+        return LOB_BUFFER
+
+
+    def get_lob_cap(self, limit):
+        """ Cap a payload size to the data type limit, max_allowed_packet and the LOB buffer. """
+        return max(0, min(limit, self.max_packet - LOB_PACKET_MARGIN, LOB_BUFFER_SIZE))
+
+
+    def clamp_lob_row(self, params):
+
+        """
+            Share the packet budget between the LOB columns of a row, so that one row never exceeds max_allowed_packet.
+            The budget excludes the bytes gen_batches() counts for the other columns.
+        """
+
+        lob_idx = [i for i, param in enumerate(params) if param and param[0] in ['lob', 'bin']]
+        row_cap = max(0, self.max_packet - LOB_PACKET_MARGIN - self.row_fixed_bytes(params))
+
+        if sum(params[i][-1] for i in lob_idx) <= row_cap:
+            return
+
+        col_cap = row_cap // len(lob_idx)
+
+        for i in lob_idx:
+            params[i] = params[i][:1] + tuple(min(size, col_cap) for size in params[i][1:])
+
+
+    def row_fixed_bytes(self, params):
+
+        """ Maximum bytes of a row excluding LOB columns, as counted by gen_batches(). """
+
+        fixed = 32 * len(params)
+
+        for param in params:
+            if not param:
+                continue
+            if param[0] in ['s', 'ck']:
+                fixed += param[1]
+            elif param[0] == 'uuid':
+                fixed += 16
+            elif param[0] == 'enum' and param[1]:
+                fixed += max(len(choice) for choice in param[1])
+            elif param[0] == 'json':
+                fixed += 128
+            elif param[0] == 'dist' and param[5]:
+                fixed += max(len(str(choice)) for choice in param[5])
+
+        return fixed
+
+
+    def get_distribution(self, table, column):
+        """ Get the DISTRIBUTIONS spec of a column, if any. """
+        return DISTRIBUTIONS.get(table + '.' + column, DISTRIBUTIONS.get(column))
+
+
+    def dist_param(self, spec, dtype, column):
+
+        """
+            Convert a uniform column parameter into a distribution parameter: ('dist', Distribution, start, end, dec_places, choices, base).
+            Zipf, exponential and weighted-list samples are offsets from base: 0, or the column minimum when positive (1 for FKs).
+        """
+
+        dec_places = None
+        choices = None
+
+        if dtype[0] == 'i':
+            start, end = dtype[1], dtype[2]
+        elif dtype[0] in ['ifk1', 'ifkm']: # FK fan-out over existing referenced keys
+            start, end = 1, max(dtype[1], 1)
+        elif dtype[0] == 'f':
+            start, end, dec_places = (-99 if dtype[3] else 0), dtype[1], dtype[2]
+        elif dtype[0] == 'dc':
+            start, end, dec_places = 10, 99, dtype[1]
+        elif dtype[0] == 'y':
+            start, end = self.start_year, self.end_year
+        elif dtype[0] == 'enum':
+            start, end, choices = 0, len(dtype[1]) - 1, dtype[1]
+        else:
+            print('** distribution not supported for column: ' + column)
+            return dtype
+
+        if spec[0] == 'weighted' and isinstance(spec[1], dict):
+            choices = list(spec[1].keys())
+            start, end = 0, len(choices) - 1
+
+        base = max(start, 0)
+
+        if spec[0] == 'weighted':
+            end = min(end, base + len(spec[1]) - 1)
+
+        num_ranks = min(int(end - base) + 1, DIST_MAX_RANKS)
+
+        return ('dist', Distribution(spec, num_ranks), start, end, dec_places, choices, base)
+
+
+    def gen_dist(self, dist, start, end, dec_places, choices, base):
+
+        """ Generate values of a distribution in batches, mapped to the column range. """
+
+        absolute = dist.kind == 'normal'
+
+        while True:
+            for val in dist.sample(DIST_BATCH):
+                if not absolute:
+                    val += base
+                val = min(max(val, start), end)
+                if dec_places is None:
+                    val = int(round(val))
+                    if choices:
+                        val = choices[val - start]
+                else:
+                    val = round(val, dec_places)
+                yield val
+
+
+    def get_fan_out(self, spec, table, fk_column, num_keys):
+
+        """
+            Share of rows per jumbled key from a zipf or weighted-list spec: ranks/indexes apply to the keys in their
+            random jumbled order (not to FK values as during the fill). None for other specs.
+        """
+
+        if spec[0] not in ['zipf', 'weighted'] or isinstance(spec[1], dict):
+            print('\n** fan-out skew needs a zipf or weighted-list distribution: `' + table + '`.`' + fk_column + '` jumbled uniformly')
+            return None
+
+        weights = Distribution(spec, num_keys).pmf[:num_keys]
+        weights += [0.0] * (num_keys - len(weights))
+
+        return weights
+
+
+    def skew_foreign_key(self, table, fk_column, keys, fan_out):
+
+        """
+            Reassign the foreign key of every row of the table to one of keys, with the share of rows per key from fan_out.
+            Each UPDATE picks a row's key with one RAND() over cumulative bounds, so rows are never reassigned.
+            Key lists too long for max_allowed_packet are split into groups: rows are first tagged with a group's first key,
+            then each group's rows are assigned within the group.
+        """
+
+        allocated = [(key, share) for key, share in zip(keys, fan_out) if share > 0]
+
+        if not allocated:
+            return 0
+
+        budget = self.max_packet - LOB_PACKET_MARGIN
+        groups = [[]]
+        group_bytes = 0
+
+        for key, share in allocated:
+            key_bytes = len(self.sql_literal(str(key))) + 26 # literal, bound and separators
+            if groups[-1] and group_bytes + key_bytes > budget:
+                groups.append([])
+                group_bytes = 0
+            groups[-1].append((key, share))
+            group_bytes += key_bytes
+
+        try:
+
+            with CONN.cursor() as cursor:
+
+                if len(groups) == 1:
+                    return self.interval_update(cursor, table, fk_column, allocated)
+
+                tags = [(group[0][0], sum(share for _, share in group)) for group in groups]
+                updated = self.interval_update(cursor, table, fk_column, tags)
+
+                for group in groups:
+                    self.interval_update(cursor, table, fk_column, group, group[0][0])
+
+                return updated
+
+        except DB_DRIVER.error as err:
+            print('\n** fan-out skew failed for `' + table + '`.`' + fk_column + '`: ' + str(err))
+            return 0
+
+
+    def interval_update(self, cursor, table, fk_column, allocated, tag=None):
+
+        """ UPDATE rows (those tagged with tag, if given) to keys drawn by share: ELT(INTERVAL(RAND(), bounds), keys). """
+
+        total = sum(share for _, share in allocated)
+        bounds = ['-1']
+        cumulative = 0.0
+
+        for _, share in allocated[:-1]:
+            cumulative += share
+            bounds.append(repr(cumulative / total))
+
+        key_update = """
+            UPDATE `%s`
+            SET `%s` = ELT(INTERVAL(RAND(), %s), %s)
+            """ % (
+                table,
+                fk_column,
+                ','.join(bounds),
+                ','.join([self.sql_literal(str(key)) for key, _ in allocated])
+            )
+
+        if tag is not None:
+            key_update += "WHERE `%s` = %s" % (fk_column, self.sql_literal(str(tag)))
+
+        if EXTENDED_DEBUG:
+            print(key_update)
+
+        cursor.execute(key_update)
+        return cursor.rowcount
+
+
+    def get_lob_size(self, table, column, limit):
+        """ Get (min, max) payload size of a TEXT/BLOB/VARBINARY column from LOB_SIZES, capped. """
+        size = LOB_SIZES.get(table + '.' + column, LOB_SIZES.get(column, LOB_DEFAULT_SIZE))
+        cap = self.get_lob_cap(limit)
+        if size[1] > cap and cap == LOB_BUFFER_SIZE:
+            print('** `' + table + '`.`' + column + '` payload size capped at LOB_BUFFER_SIZE (' + str(LOB_BUFFER_SIZE) + ' bytes)')
+        return (min(size[0], cap), min(size[1], cap))
 
 
     def gen_char_key(self, length, cols):
@@ -502,24 +1225,21 @@ class MySQLFiller():
         sql_keys = """
             SELECT `%s`
             FROM `%s`
-            WHERE `%s` = '%s'
+            WHERE `%s` = %%s
             LIMIT 1
             """ % (
                 cols[1],
                 cols[0],
-                cols[1],
-                new_key
+                cols[1]
             )
 
-        with CONN.cursor() as cursor:
-            cursor.execute(sql_keys)
-            key_lookup = cursor.fetchall()
+        key_lookup = self.fetch_prepared(sql_keys, (new_key,))
 
         if key_lookup:
             # not bullet-proof, processes can collide
             while True:
                 new_key = self.gen_string(length)
-                if new_key != key_lookup[0][cols[1]]:
+                if new_key != key_lookup[0][0]:
                     break
 
         return new_key
@@ -543,6 +1263,136 @@ class MySQLFiller():
         return zips
 
 
+    def text(self, val):
+        """ Decode metadata returned as bytes (MySQL 8 information_schema). """
+        return val.decode(BYTES_DECODE) if isinstance(val, (bytes, bytearray)) else val
+
+
+    def fetch_prepared(self, query, args=None):
+
+        """ Execute a hot lookup on a reused cursor: a server-side prepared statement where the driver supports it. """
+
+        cursor = PREPARED.get(query)
+
+        if cursor is None:
+            cursor = DB_DRIVER.cursor(CONN, prepared=True)
+            PREPARED[query] = cursor
+
+        cursor.execute(query, args)
+        return cursor.fetchall()
+
+
+    def benchmark_drivers(self, tables):
+
+        """
+            Measure client insert throughput of each installed driver on the database tables, rolling back the inserts.
+            After an untimed warm-up pass, BENCHMARK_ROUNDS rounds run the drivers in alternating order.
+        """
+
+        names = Driver.installed()
+        totals = {name: [0, 0.0] for name in names}
+
+        self.get_lob_buffer() # allocate before timing any driver
+
+        if names:
+            self.benchmark_driver(names[0], tables) # warm the buffer pool and metadata caches
+
+        for bench_round in range(BENCHMARK_ROUNDS):
+            for name in (names if bench_round % 2 == 0 else names[::-1]):
+                rows, elapsed = self.benchmark_driver(name, tables)
+                totals[name][0] += rows
+                totals[name][1] += elapsed
+
+        throughput = {}
+
+        for name in names:
+            rows, elapsed = totals[name]
+            throughput[name] = rows / elapsed if elapsed else 0
+            print('%-16s %12.0f rows/s  (%d rows, %.3fs)' % (name, throughput[name], rows, elapsed))
+
+        if throughput:
+            print('\nfastest: ' + max(throughput, key=throughput.get))
+
+
+    def benchmark_driver(self, name, tables):
+
+        """
+            Insert NUM_ROWS rows into each table with the driver and roll back; return (rows, seconds).
+            Only executemany is timed: rows are generated beforehand (with the driver's connection for key lookups)
+            and LOB slices converted to bytes, so every driver times the same work.
+        """
+
+        global CONN, DB_DRIVER
+
+        default = (CONN, DB_DRIVER)
+
+        DB_DRIVER = Driver(name)
+        CONN = db_connect(DB_DRIVER)
+        PREPARED.clear()
+
+        rows = 0
+        elapsed = 0.0
+
+        for table in tables:
+
+            table_name, cols, params = self.table_params(table)
+
+            if table_name == '':
+                continue
+
+            insert = self.insert_query(table_name, cols)
+
+            with CONN.cursor() as cursor:
+                try:
+                    batches = [
+                        [[val.tobytes() if isinstance(val, memoryview) else val for val in row] for row in values]
+                        for values in self.gen_batches(params, NUM_ROWS)
+                    ]
+                    start = time.time()
+                    for values in batches:
+                        cursor.executemany(insert, values)
+                    elapsed += time.time() - start
+                    rows += NUM_ROWS
+                except DB_DRIVER.error as err:
+                    if DEBUG:
+                        print('`' + table + '` ' + str(err))
+                CONN.rollback()
+
+        PREPARED.clear()
+        CONN.close()
+
+        CONN, DB_DRIVER = default
+
+        return (rows, elapsed)
+
+
+    def get_max_packet(self):
+
+        """ Get the session max_allowed_packet for batch and payload sizing. """
+
+        with CONN.cursor() as cursor:
+            cursor.execute('SELECT @@max_allowed_packet')
+            packet_result = cursor.fetchall()
+
+        if packet_result:
+            self.max_packet = int(packet_result[0][0])
+
+
+    def get_server_version(self):
+
+        """ Check server support of recursive CTEs (MySQL 8.0+, MariaDB 10.2+) for server-side generation. """
+
+        with CONN.cursor() as cursor:
+            cursor.execute('SELECT VERSION()')
+            version_result = cursor.fetchall()
+
+        if version_result:
+            version = self.text(version_result[0][0])
+            self.mariadb = 'mariadb' in version.lower()
+            major_minor = tuple(int(v) for v in re.findall(r'\d+', version)[:2])
+            self.seq_cte = major_minor >= ((10, 2) if self.mariadb else (8, 0))
+
+
     def get_foreign_keys(self):
 
         """ Populate foreign key array from database tables. """
@@ -564,10 +1414,10 @@ class MySQLFiller():
 
         fks = {}
 
-        for tab_attrib in fks_results:
-            fks[tab_attrib['COLUMN_NAME']] = {
-                'table': tab_attrib['REFERENCED_TABLE_NAME'],
-                'column': tab_attrib['REFERENCED_COLUMN_NAME']
+        for column_name, ref_table, ref_column in fks_results:
+            fks[column_name] = {
+                'table': ref_table,
+                'column': ref_column
             }
 
         self.foreign_keys = fks
@@ -579,10 +1429,10 @@ class MySQLFiller():
 
         fk_query = """
             SELECT
-                TABLE_NAME 'table',
-                COLUMN_NAME 'fk_column',
-                REFERENCED_TABLE_NAME 'ref_table',
-                REFERENCED_COLUMN_NAME 'ref_table_key'
+                TABLE_NAME,
+                COLUMN_NAME,
+                REFERENCED_TABLE_NAME,
+                REFERENCED_COLUMN_NAME
             FROM
                 information_schema.KEY_COLUMN_USAGE
             WHERE
@@ -595,11 +1445,11 @@ class MySQLFiller():
 
         table_keys = {}
 
-        for k_data in key_results:
-            table_keys[k_data['table']] = {
-                'fk_column': k_data['fk_column'],
-                'ref_table': k_data['ref_table'],
-                'ref_table_key': k_data['ref_table_key']
+        for table_name, fk_column, ref_table, ref_table_key in key_results:
+            table_keys[table_name] = {
+                'fk_column': fk_column,
+                'ref_table': ref_table,
+                'ref_table_key': ref_table_key
             }
 
         uk_query = """
@@ -620,8 +1470,7 @@ class MySQLFiller():
         unique_keys = []
 
         for col_val in unique_results:
-            for _, u_key in col_val.items():
-                unique_keys.append(u_key)
+            unique_keys.append(col_val[0])
 
         limit = str(math.ceil(NUM_ROWS * (FK_PCT_REPLACE / 100)))
         error = False
@@ -651,34 +1500,46 @@ class MySQLFiller():
                 print('\njumble_foreign_keys() failed for table: `' + table_name + '`')
                 continue
 
+            dist_spec = self.get_distribution(table_name, tdata['fk_column'])
+            fan_out = None
+            if dist_spec and tdata['fk_column'] not in unique_keys:
+                fan_out = self.get_fan_out(dist_spec, table_name, tdata['fk_column'], len(results))
+
+            if fan_out: # skewed fan-out: share of rows per referenced key follows the distribution
+                if not self.skew_foreign_key(table_name, tdata['fk_column'], [col_val[0] for col_val in results], fan_out):
+                    error = True
+                    error_tables.append(table_name)
+                continue
+
             with CONN.cursor() as cursor:
 
                 for col_val in results:
 
-                    for _, val in col_val.items():
+                    val = col_val[0]
 
-                        if tdata['fk_column'] in unique_keys: # avoid duplicates (re:shipapp)
-                            continue
+                    if tdata['fk_column'] in unique_keys: # avoid duplicates (re:shipapp)
+                        continue
 
-                        key_update = """
-                            UPDATE `%s`
-                            SET `%s` = '%s'
-                            ORDER BY RAND()
-                            LIMIT %s
-                            """ % (
-                                table_name,
-                                tdata['fk_column'],
-                                str(val),
-                                limit
-                            )
+                    key_update = """
+                        UPDATE `%s`
+                        SET `%s` = '%s'
+                        ORDER BY RAND()
+                        LIMIT %s
+                        """ % (
+                            table_name,
+                            tdata['fk_column'],
+                            str(val),
+                            limit
+                        )
 
-                        if EXTENDED_DEBUG:
-                            print(key_update)
+                    if EXTENDED_DEBUG:
+                        print(key_update)
 
-                        upresult = cursor.execute(key_update)
-                        if not upresult:
-                            error = True
-                            error_tables.append(table_name)
+                    cursor.execute(key_update)
+                    upresult = cursor.rowcount
+                    if not upresult:
+                        error = True
+                        error_tables.append(table_name)
 
         if error:
             print('\nforeign key jumbling denied in tables: ' + ','.join(error_tables) + ' (check UPDATE GRANT for user)')
@@ -688,27 +1549,67 @@ class MySQLFiller():
 # end class
 
 
-# Ugly database connect – for spawned processes requiring shared global object.
-try:
-    CONN = None
-    CONN = MySQLdb.connect(**DB_CONFIG)
-    with CONN.cursor() as cursor:
+def db_connect(driver):
+
+    """ Connect with the driver and set the session options for filling. """
+
+    conn = driver.connect(DB_CONFIG)
+    with conn.cursor() as cursor:
         cursor.execute('SET SESSION foreign_key_checks = OFF')
         cursor.execute('SET SESSION unique_checks = OFF')
         # cursor.execute('SET sql_mode=(SELECT CONCAT(@@session.sql_mode, ",ALLOW_INVALID_DATES"))')
         if DB_CONFIG['user'] == 'root' and MAX_PACKET:
             cursor.execute('SET GLOBAL max_allowed_packet = 268435456')
-except MySQLdb.Error as err:
-    print('Failed to connect to database: (%d) %s' % (err.args[0], err.args[1]))
-    print('Check database name and database access privileges.')
-    sys.exit(1)
+    return conn
+
+
+def db_init():
+
+    """ Load the configured driver and connect this process. """
+
+    global CONN, DB_DRIVER
+
+    try:
+        DB_DRIVER = Driver(DRIVER)
+    except ImportError as err:
+        print('Database driver `' + DRIVER + '` not available: ' + str(err))
+        sys.exit(1)
+
+    try:
+        CONN = db_connect(DB_DRIVER)
+    except DB_DRIVER.error as err:
+        print('Failed to connect to database: ' + str(err))
+        print('Check database name and database access privileges.')
+        sys.exit(1)
+
+
+def init_worker(schema):
+
+    """ Pool initializer: connect once and keep a worker MySQLFiller holding the schema. """
+
+    global FILLER, INHERITED_CONN
+
+    # a 'fork' worker inherits the parent connection: keep it referenced so it is never closed over the shared socket
+    INHERITED_CONN = CONN
+
+    db_init()
+    FILLER = MySQLFiller(schema)
+
+
+def fill_table(table):
+    """ Pool task: populate one table. """
+    return FILLER.worker(table)
+
+
+def ping_worker(sent):
+    """ Pool warm-up task: worker pid and dispatch latency from the parent (perf_counter is system-wide on Linux, macOS and Windows). """
+    return (os.getpid(), time.perf_counter() - sent)
 
 
 def main():
 
-    """ Set multiprocessing type then invoke class. """
+    """ Invoke class; the multiprocessing start method is START_METHOD. """
 
-    mp.set_start_method('spawn') # 'fork' overrides 'spawn' default of MacOS Py3.8
     MySQLFiller()
 
 